@@ -1,8 +1,173 @@
+import asyncio
+import contextlib
+import httpx
+import orjson
 import requests
 import json
+import logging
+import math
+import random
+import re
+import sys
+import threading
 import time
-import csv
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+# Column order of the output CSV; matches the tuples returned by _process_permit_data
+CSV_FIELDNAMES = ["permit_number", "address", "contractor", "issued_date", "permit_type", "status"]
+# Output file buffer; large enough that the OS sees a few big writes instead of one per row
+CSV_BUFFER_SIZE = 1 << 20
+# Date format the API's search form expects
+DATE_FORMAT = '%m/%d/%Y'
+
+# Microsoft JSON date, e.g. '/Date(1743058800000)/' or '/Date(1743058800000-0700)/'
+_MSDATE_RE = re.compile(r'/Date\((-?\d+)(?:([+-])(\d{2})(\d{2}))?\)/')
+_EPOCH = date(1970, 1, 1)
+_MS_PER_DAY = 86_400_000
+# Phoenix is UTC-7 all year (Arizona has no DST)
+_PHOENIX_OFFSET_MS = -7 * 3_600_000
+
+@lru_cache(maxsize=4096)
+def _parse_ms_date(date_string):
+    """
+    Converts a Microsoft JSON date string to 'YYYY-MM-DD'.
+
+    Cached because permits issued in the same batch share an IssuedDate string.
+
+    Args:
+        date_string (str): The date string from the API response.
+
+    Returns:
+        str: Date formatted as 'YYYY-MM-DD', or None if the string doesn't match or is out of range.
+    """
+    match = _MSDATE_RE.match(date_string)
+    if not match:
+        return None
+    timestamp_ms, sign, offset_hours, offset_minutes = match.groups()
+    # The millisecond value is UTC; shift it to local time before taking the day,
+    # using the string's own offset if it has one and Phoenix time otherwise
+    if sign:
+        offset_ms = (int(offset_hours) * 60 + int(offset_minutes)) * 60_000
+        offset_ms = -offset_ms if sign == '-' else offset_ms
+    else:
+        offset_ms = _PHOENIX_OFFSET_MS
+    days = (int(timestamp_ms) + offset_ms) // _MS_PER_DAY
+    try:
+        return (_EPOCH + timedelta(days=days)).isoformat()
+    except (OverflowError, ValueError):
+        return None # Outside the range datetime.date can represent
+
+# Characters that force a CSV field to be quoted (csv.QUOTE_MINIMAL rules)
+_NEEDS_QUOTE = re.compile(r'[,"\r\n]')
+
+def _format_csv_field(value):
+    """
+    Formats one value as a CSV field, quoting it only when necessary.
+
+    Args:
+        value: The field value; None is written as an empty field.
+
+    Returns:
+        str: The CSV-encoded field.
+    """
+    text = '' if value is None else str(value)
+    if _NEEDS_QUOTE.search(text):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+# --- CsvRowWriter Class Definition ---
+class CsvRowWriter:
+    """
+    A minimal drop-in for csv.writer that joins fields with str.join.
+
+    Output matches csv.writer's defaults (comma delimiter, minimal quoting,
+    '\r\n' line endings). Permit fields are short and rarely need quoting,
+    so skipping the csv module's per-field dialect handling is noticeably faster.
+    """
+
+    def __init__(self, csvfile):
+        """
+        Args:
+            csvfile: A text file opened with newline=''.
+        """
+        self._write = csvfile.write
+
+    def writerow(self, row):
+        """Writes a single row."""
+        self._write(','.join(map(_format_csv_field, row)) + '\r\n')
+
+    def writerows(self, rows):
+        """Writes several rows with a single write call."""
+        self._write(''.join([','.join(map(_format_csv_field, row)) + '\r\n' for row in rows]))
+
+# --- RateLimiter Class Definition ---
+class RateLimiter:
+    """
+    A token-bucket rate limiter shared by the synchronous and async request paths.
+
+    Requests only wait when they would push the average rate above max_rate
+    per second; a fast server is no longer paid a fixed delay per page.
+    """
+
+    def __init__(self, max_rate, burst=None):
+        """
+        Initializes the limiter with a full bucket.
+
+        Args:
+            max_rate (float): Sustained requests allowed per second.
+            burst (int): Requests that may go out back to back. Defaults to max_rate.
+        """
+        self.max_rate = max_rate
+        self.capacity = burst or max(1, max_rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock() # Page 1 is requested from a worker thread
+
+    def _reserve(self):
+        """
+        Takes a token, letting the bucket go negative to queue callers in order.
+
+        Returns:
+            float: Seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            # During a pause the refill clock sits in the future and the bucket doesn't refill
+            if now > self._updated:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.max_rate)
+                self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.max_rate if self._tokens < 0 else 0.0
+            # Queued requests are spaced out after the pause rather than all released when it ends
+            return (self._updated - now) + wait
+
+    def pause(self, seconds):
+        """
+        Holds back every request for the given time, e.g. after a Retry-After response.
+
+        Args:
+            seconds (float): How long to pause from now.
+        """
+        with self._lock:
+            self._updated = max(self._updated, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0)
+
+    def acquire(self):
+        """Blocks until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Waits, without blocking the event loop, until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
 
 # --- PhoenixPermitScraper Class Definition ---
 class PhoenixPermitScraper:
@@ -13,41 +178,139 @@ class PhoenixPermitScraper:
     DEFAULT_HEADERS = {
         'Content-Type': 'application/x-www-form-urlencoded',
         'X-Requested-With': 'XMLHttpRequest'
+        # Accept-Encoding is left to the clients: requests and httpx both already
+        # negotiate gzip/deflate (and br when a decoder is installed)
         # Add other headers like User-Agent if necessary based on testing
         # 'User-Agent': 'Mozilla/5.0 ...'
     }
-
-    def __init__(self, page_size=50):
+    # (connect, read) timeouts in seconds, so a hung connection can't stall a run
+    REQUEST_TIMEOUT = (5, 30)
+    # Transient failures worth retrying; anything else fails immediately
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    # Keep-alive connections kept open by the requests adapter, so TLS handshakes are amortized across pages
+    POOL_SIZE = 16
+    # Connections the async client may open; HTTP/2 multiplexes all pages over one of them
+    ASYNC_MAX_CONNECTIONS = 4
+    # Processed rows collected across pages before each writerows call
+    WRITE_BATCH_SIZE = 1000
+    # API keys for each CSV column, in CSV_FIELDNAMES order
+    # Add other fields if needed: PID, ProjectDescription, Parcel etc.
+    _PERMIT_KEYS = ("TypeNumber", "PermitAddress", "ProfessionalName", "IssuedDate",
+                    "PermitType", # e.g., RPV
+                    "Status") # e.g., OPEN, DONE
+    _PERMIT_FIELDS = staticmethod(itemgetter(*_PERMIT_KEYS))
+    # Search form fields that are the same for every request, url-encoded once
+    _STATIC_FORM = urlencode({
+        'sort': '',
+        'group': '',
+        'filter': '',
+        'PermitType': '',
+        'PermitNumber': '',
+        'TempPermit': 'Y',
+        'AddrNumber': '',
+        'AddrDirection': '',
+        'AddrStreet': '',
+        'AddrType': '',
+        'ProfName': '',
+        'ProfStateLicense': '',
+        'ProjectNumber': '',
+        'ProjectName': '',
+        'SolarGreenAdaptive': 'solar'
+    })
+
+    def __init__(self, page_size=50, max_concurrency=8, max_retries=3, backoff_base=0.5, backoff_cap=30,
+                 max_requests_per_second=2):
         """
         Initializes the scraper.
 
         Args:
             page_size (int): Number of results to request per API call.
+            max_concurrency (int): Maximum number of page requests in flight at once.
+            max_retries (int): Retries per request after the first attempt fails with a transient error.
+            backoff_base (float): Initial retry delay in seconds, doubled on each attempt.
+            backoff_cap (float): Upper bound in seconds for a single retry delay.
+            max_requests_per_second (float): Sustained request rate across all pages, to be polite to the server.
         """
         self.page_size = page_size
-        self.session = requests.Session() # Use a session for potential connection pooling
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.rate_limiter = RateLimiter(max_requests_per_second)
+        self.session = requests.Session() # Use a session for connection pooling
         self.session.headers.update(self.DEFAULT_HEADERS)
+        # Retries are handled in _make_request, so the adapter itself must not retry
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE,
+                                                max_retries=0)
+        self.session.mount('https://', adapter)
+
+    def _backoff_delay(self, attempt, retry_after=None):
+        """
+        Computes how long to wait before retrying a failed request.
+
+        Args:
+            attempt (int): The 0-based attempt number that just failed.
+            retry_after (str): The server's Retry-After header value, if any.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        if retry_after is not None:
+            try:
+                server_delay = float(retry_after)
+            except ValueError:
+                server_delay = None # HTTP-date form; fall back to our own backoff
+            # Don't trust the header blindly: negative values would crash sleep, huge ones would stall the run
+            if server_delay is not None and math.isfinite(server_delay):
+                return max(0.0, min(self.backoff_cap, server_delay))
+        return min(self.backoff_cap, self.backoff_base * 2 ** attempt) + random.uniform(0, 0.25)
 
     def _make_request(self, payload):
         """
-        Sends the POST request to the API endpoint.
+        Sends the POST request to the API endpoint, retrying transient failures.
 
         Args:
-            payload (dict): The data payload for the POST request.
+            payload (bytes): The url-encoded body for the POST request.
 
         Returns:
             dict: The parsed JSON response data, or None if the request fails.
         """
-        try:
-            response = self.session.post(self.BASE_URL, data=payload)
-            response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error during request: {e}")
-        except json.JSONDecodeError:
-            print(f"Error decoding JSON response. Status: {response.status_code}, Text: {response.text[:200]}...")
-        except Exception as e:
-            print(f"An unexpected error occurred during request: {e}")
+        error = None
+        for attempt in range(self.max_retries + 1):
+            response = None
+            retry_after = None
+            try:
+                self.rate_limiter.acquire()
+                response = self.session.post(self.BASE_URL, data=payload, timeout=self.REQUEST_TIMEOUT)
+                response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError, caught below
+                return orjson.loads(response.content)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                error = e
+            except requests.exceptions.HTTPError as e:
+                if response.status_code not in self.RETRY_STATUS_CODES:
+                    logger.error("Error during request: %s", e)
+                    return None
+                error = e
+                retry_after = response.headers.get('Retry-After')
+            except json.JSONDecodeError:
+                logger.error("Error decoding JSON response. Status: %s, Text: %s...", response.status_code, response.text[:200])
+                return None
+            except requests.exceptions.RequestException as e:
+                logger.error("Error during request: %s", e)
+                return None
+            except Exception as e:
+                logger.error("An unexpected error occurred during request: %s", e)
+                return None
+
+            if attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, retry_after)
+                if retry_after is not None:
+                    self.rate_limiter.pause(delay) # The server asked everyone to back off
+                logger.warning("Transient error during request: %s. Retrying in %.1f seconds...", error, delay)
+                time.sleep(delay)
+
+        logger.error("Error during request: giving up after %d attempts (%s)", self.max_retries + 1, error)
         return None
 
     def _parse_date(self, date_string):
@@ -60,167 +323,461 @@ class PhoenixPermitScraper:
         Returns:
             str: Date formatted as 'YYYY-MM-DD', or None if parsing fails.
         """
-        if not date_string or not date_string.startswith('/Date('):
-            return None
-        try:
-            timestamp_ms = int(date_string.strip('/Date()'))
-            dt_object = datetime.fromtimestamp(timestamp_ms / 1000)
-            return dt_object.strftime('%Y-%m-%d')
-        except (ValueError, TypeError):
-            print(f"Warning: Could not parse date string: {date_string}")
+        if not date_string or not isinstance(date_string, str):
             return None
+        parsed = _parse_ms_date(date_string)
+        if parsed is None and date_string.startswith('/Date('):
+            logger.warning("Could not parse date string: %s", date_string)
+        return parsed
 
-    def _process_permit_data(self, permit_json):
+    def _process_permit_data(self, permit_json, date_cache=None):
         """
         Extracts and formats relevant data from a single permit JSON object.
 
         Args:
             permit_json (dict): A dictionary representing a single permit.
+            date_cache (dict): Parsed issue dates keyed by raw date string, shared
+                across a page since permits are issued in batches.
 
         Returns:
-            dict: A dictionary containing the desired fields, or None if essential data is missing.
+            tuple: The desired fields in CSV_FIELDNAMES order, or None if essential data is missing.
         """
-        permit_number = permit_json.get("TypeNumber")
-        address = permit_json.get("PermitAddress")
-        contractor = permit_json.get("ProfessionalName")
-        issued_date_raw = permit_json.get("IssuedDate")
-        issued_date = self._parse_date(issued_date_raw)
-        permit_type = permit_json.get("PermitType") # e.g., RPV
-        status = permit_json.get("Status") # e.g., OPEN, DONE
+        try:
+            permit_number, address, contractor, issued_date_raw, permit_type, status = self._PERMIT_FIELDS(permit_json)
+        except KeyError:
+            # Some records omit optional keys entirely; treat those as empty
+            permit_number, address, contractor, issued_date_raw, permit_type, status = map(
+                permit_json.get, self._PERMIT_KEYS)
 
         # Basic validation - require at least permit number and address
         if not permit_number or not address:
             return None
 
-        return {
-            "permit_number": permit_number,
-            "address": address,
-            "contractor": contractor,
-            "issued_date": issued_date,
-            "permit_type": permit_type,
-            "status": status
-            # Add other fields if needed: PID, ProjectDescription, Parcel etc.
-        }
+        # Only a handful of distinct types and statuses exist; share one string object per value
+        if isinstance(permit_type, str):
+            permit_type = sys.intern(permit_type)
+        if isinstance(status, str):
+            status = sys.intern(status)
 
-    def fetch_permits_for_date_range(self, start_date_str, end_date_str, delay_seconds=1):
+        if date_cache is None:
+            issued_date = self._parse_date(issued_date_raw)
+        else:
+            issued_date = date_cache.get(issued_date_raw)
+            if issued_date is None:
+                issued_date = date_cache[issued_date_raw] = self._parse_date(issued_date_raw)
+
+        return (permit_number, address, contractor, issued_date, permit_type, status)
+
+    def _build_payload(self, page, start_date_str, end_date_str, page_size=None):
+        """
+        Builds the form body for a single page of the permit search.
+
+        Only the paging and date fields change between requests; they are
+        appended to the pre-encoded _STATIC_FORM.
+
+        Args:
+            page (int): The 1-based page number to request.
+            start_date_str (str): Start date in 'MM/DD/YYYY' format.
+            end_date_str (str): End date in 'MM/DD/YYYY' format.
+            page_size (int): Overrides self.page_size for this request.
+
+        Returns:
+            bytes: The url-encoded body for the POST request.
+        """
+        return (self._STATIC_FORM + '&' + urlencode({
+            'page': page,
+            'pageSize': page_size or self.page_size,
+            'SolarGreenAdaptiveStartDate': start_date_str,
+            'SolarGreenAdaptiveEndDate': end_date_str
+        })).encode('ascii')
+
+    def negotiate_page_size(self, start_date_str, end_date_str, max_page_size=500):
+        """
+        Probes the API for the largest page size it honours and adopts it.
+
+        Every page costs a full round trip, so fewer, larger pages cut total
+        fetch time roughly in proportion; the trade-off is more memory and JSON
+        parsing per response. Starting at max_page_size, the size is halved
+        until page 1 of the given range comes back full with more records
+        still to fetch, never going below the current page_size. A range too
+        small to fill the probed pages leaves page_size unchanged.
+
+        Args:
+            start_date_str (str): Start date in 'MM/DD/YYYY' format.
+            end_date_str (str): End date in 'MM/DD/YYYY' format.
+            max_page_size (int): The largest page size to try.
+
+        Returns:
+            int: The page size now in use.
+        """
+        candidate = max_page_size
+        while candidate > self.page_size:
+            logger.info("  Probing page size %d...", candidate)
+            response_data = self._make_request(self._build_payload(1, start_date_str, end_date_str, candidate))
+            if response_data is not None:
+                permit_list_json = response_data.get("Data") or []
+                # Only a full page with more records left proves the size is honoured;
+                # if everything fits on one page we can't tell, so keep probing smaller
+                if response_data.get("Total", 0) > candidate and len(permit_list_json) == candidate:
+                    self.page_size = candidate
+                    break
+            candidate //= 2
+        logger.info("  Using page size %d.", self.page_size)
+        return self.page_size
+
+    def _process_page(self, permit_list_json):
+        """
+        Processes one page of permit JSON objects.
+
+        Only the CSV fields survive, so the rest of each record (descriptions,
+        parcel data etc.) can be freed as soon as the page is processed.
+
+        Args:
+            permit_list_json (list): The 'Data' list from an API response.
+
+        Returns:
+            list: The processed permit tuples for the valid permits on the page.
+        """
+        processed_batch = []
+        date_cache = {}
+        for permit_json in permit_list_json:
+            processed = self._process_permit_data(permit_json, date_cache)
+            if processed:
+                processed_batch.append(processed)
+        return processed_batch
+
+    def _drop_seen(self, processed_batch, seen_permits):
+        """
+        Removes permits that have already been emitted, by permit number.
+
+        Args:
+            processed_batch (list): The processed permit tuples from one page.
+            seen_permits (set): Permit numbers emitted so far; updated in place.
+
+        Returns:
+            list: The permits from processed_batch not seen before.
+        """
+        unseen_batch = []
+        for processed in processed_batch:
+            permit_number = processed[0]
+            if permit_number not in seen_permits:
+                seen_permits.add(permit_number)
+                unseen_batch.append(processed)
+        return unseen_batch
+
+    def _queue_rows(self, pending_rows, processed_batch, writer):
+        """
+        Adds a page's rows to the pending write batch, writing the batch out
+        once it reaches WRITE_BATCH_SIZE.
+
+        Args:
+            pending_rows (list): Rows not yet written; emptied when written.
+            processed_batch (list): The processed permit tuples from one page.
+            writer (CsvRowWriter): Destination for processed permits, or None.
+        """
+        if writer is None:
+            return
+        pending_rows.extend(processed_batch)
+        if len(pending_rows) >= self.WRITE_BATCH_SIZE:
+            writer.writerows(pending_rows)
+            pending_rows.clear()
+
+    async def _fetch_page(self, client, semaphore, page, start_date_str, end_date_str):
+        """
+        Sends the POST request for a single page using the async httpx client,
+        retrying transient failures.
+
+        Args:
+            client (httpx.AsyncClient): The shared async HTTP client.
+            semaphore (asyncio.Semaphore): Caps the number of in-flight requests.
+            page (int): The 1-based page number to request.
+            start_date_str (str): Start date in 'MM/DD/YYYY' format.
+            end_date_str (str): End date in 'MM/DD/YYYY' format.
+
+        Returns:
+            list: The processed permit tuples from the page, or None if the request fails.
+        """
+        payload = self._build_payload(page, start_date_str, end_date_str)
+        error = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            async with semaphore:
+                try:
+                    await self.rate_limiter.acquire_async()
+                    response = await client.post(self.BASE_URL, content=payload)
+                    response.raise_for_status()
+                    # Parse the raw body ourselves; the API does not always label its JSON correctly
+                    response_data = orjson.loads(response.content)
+                    del response
+                    # Project the page here so only the CSV fields are held while
+                    # other pages are still in flight
+                    return self._process_page(response_data.get("Data") or [])
+                except (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError) as e:
+                    error = e
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code not in self.RETRY_STATUS_CODES:
+                        logger.error("Error during request for page %d: %s", page, e)
+                        return None
+                    error = e
+                    retry_after = e.response.headers.get('Retry-After')
+                except json.JSONDecodeError:
+                    logger.error("Error decoding JSON response for page %d. Status: %s", page, response.status_code)
+                    return None
+                except httpx.HTTPError as e:
+                    logger.error("Error during request for page %d: %s", page, e)
+                    return None
+                except Exception as e:
+                    logger.error("An unexpected error occurred during request for page %d: %s", page, e)
+                    return None
+
+            # Sleep outside the semaphore so a backing-off page doesn't hold a slot
+            if attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, retry_after)
+                if retry_after is not None:
+                    self.rate_limiter.pause(delay) # The server asked everyone to back off
+                logger.warning("Transient error on page %d: %s. Retrying in %.1f seconds...", page, error, delay)
+                await asyncio.sleep(delay)
+
+        logger.error("Error during request for page %d: giving up after %d attempts (%s)", page, self.max_retries + 1, error)
+        return None
+
+    def _open_async_client(self):
+        """
+        Creates the HTTP/2 client used for concurrent page requests.
+
+        With HTTP/2 every page request to the API host is multiplexed over a
+        single kept-alive connection, so a run pays for one TLS handshake and
+        the repeated headers are compressed. Servers without HTTP/2 fall back
+        to a small HTTP/1.1 keep-alive pool.
+
+        Returns:
+            httpx.AsyncClient: A new client; use it as an async context manager.
+        """
+        connect_timeout, read_timeout = self.REQUEST_TIMEOUT
+        limits = httpx.Limits(max_connections=self.ASYNC_MAX_CONNECTIONS,
+                              max_keepalive_connections=self.ASYNC_MAX_CONNECTIONS)
+        return httpx.AsyncClient(http2=True, headers=self.DEFAULT_HEADERS, limits=limits,
+                                 timeout=httpx.Timeout(read_timeout, connect=connect_timeout))
+
+    async def fetch_permits_async(self, start_date_str, end_date_str, writer=None, client=None, seen_permits=None):
+        """
+        Fetches all solar permits within a given date range, fetching pages concurrently.
+
+        Page 1 is requested first to learn the total record count; every
+        remaining page is then requested at once, capped at max_concurrency
+        in-flight requests. Each page is written out as soon as it arrives,
+        so rows are not necessarily in page order.
+
+        Args:
+            start_date_str (str): Start date in 'MM/DD/YYYY' format.
+            end_date_str (str): End date in 'MM/DD/YYYY' format.
+            writer (CsvRowWriter): Destination for processed permits. If None,
+                permits are only counted.
+            client (httpx.AsyncClient): Client to reuse across several date
+                ranges in the same event loop. If None, one is opened for this call.
+            seen_permits (set): Permit numbers already emitted by other fetches;
+                matching permits are skipped and new ones added. If None, no
+                de-duplication is done.
+
+        Returns:
+            int: The number of processed permits written.
+        """
+        total_written = 0
+        pending_rows = []
+
+        logger.info("Fetching solar permits from %s to %s...", start_date_str, end_date_str)
+
+        # Page 1 goes through the synchronous session; it has to finish before
+        # we know how many pages to schedule.
+        logger.debug("  Requesting page 1...")
+        response_data = await asyncio.to_thread(
+            self._make_request, self._build_payload(1, start_date_str, end_date_str))
+
+        if response_data is None:
+            logger.error("  Failed to retrieve data for page 1. Stopping.")
+            return total_written
+
+        total_records = response_data.get("Total", 0)
+        permit_list_json = response_data.pop("Data", None) or []
+        del response_data
+        logger.info("  Total records reported by API: %d", total_records)
+        if total_records == 0:
+            logger.info("  No permits found for this date range.")
+            return total_written
+        elif not permit_list_json:
+            logger.warning("  API reported records, but none found on the first page. Stopping.")
+            return total_written
+
+        processed_batch = self._process_page(permit_list_json)
+        del permit_list_json
+        if seen_permits is not None:
+            processed_batch = self._drop_seen(processed_batch, seen_permits)
+        self._queue_rows(pending_rows, processed_batch, writer)
+        count_on_page = len(processed_batch)
+        total_written += count_on_page
+        logger.debug("  Processed %d valid permits from page 1.", count_on_page)
+
+        num_pages = math.ceil(total_records / self.page_size)
+        if num_pages > 1:
+            logger.debug("  Requesting pages 2-%d concurrently...", num_pages)
+            # A caller-provided client stays open for its owner to reuse
+            client_context = contextlib.nullcontext(client) if client else self._open_async_client()
+            async with client_context as client:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+
+                async def fetch_numbered_page(page):
+                    return page, await self._fetch_page(client, semaphore, page, start_date_str, end_date_str)
+
+                for next_page in asyncio.as_completed([fetch_numbered_page(page) for page in range(2, num_pages + 1)]):
+                    page, processed_batch = await next_page
+                    if processed_batch is None:
+                        logger.error("  Failed to retrieve data for page %d. Skipping.", page)
+                        continue
+                    if seen_permits is not None:
+                        processed_batch = self._drop_seen(processed_batch, seen_permits)
+                    self._queue_rows(pending_rows, processed_batch, writer)
+                    count_on_page = len(processed_batch)
+                    total_written += count_on_page
+                    logger.debug("  Processed %d valid permits from page %d.", count_on_page, page)
+
+        if pending_rows:
+            writer.writerows(pending_rows)
+
+        logger.info("Finished fetching %s to %s. Total processed permits: %d", start_date_str, end_date_str, total_written)
+        return total_written
+
+    def fetch_permits_for_date_range(self, start_date_str, end_date_str, writer=None):
         """
         Fetches all solar permits within a given date range, handling pagination.
 
+        Synchronous wrapper around fetch_permits_async.
+
+        Args:
+            start_date_str (str): Start date in 'MM/DD/YYYY' format.
+            end_date_str (str): End date in 'MM/DD/YYYY' format.
+            writer (CsvRowWriter): Destination for processed permits. If None,
+                permits are only counted.
+
+        Returns:
+            int: The number of processed permits written.
+        """
+        return asyncio.run(self.fetch_permits_async(start_date_str, end_date_str, writer))
+
+    def _split_date_range(self, start_date_str, end_date_str, shard_days):
+        """
+        Splits a date range into consecutive, non-overlapping sub-ranges.
+
+        Args:
+            start_date_str (str): Start date in 'MM/DD/YYYY' format.
+            end_date_str (str): End date in 'MM/DD/YYYY' format (inclusive).
+            shard_days (int): Number of days in each sub-range.
+
+        Returns:
+            list: (start_date_str, end_date_str) tuples covering the whole range.
+        """
+        shard_start = datetime.strptime(start_date_str, DATE_FORMAT).date()
+        end_date = datetime.strptime(end_date_str, DATE_FORMAT).date()
+        shards = []
+        while shard_start <= end_date:
+            shard_end = min(shard_start + timedelta(days=shard_days - 1), end_date)
+            shards.append((shard_start.strftime(DATE_FORMAT), shard_end.strftime(DATE_FORMAT)))
+            shard_start = shard_end + timedelta(days=1)
+        return shards
+
+    async def fetch_permits_parallel_async(self, start_date_str, end_date_str, writer=None, shard_days=7,
+                                           max_concurrency=8):
+        """
+        Fetches all solar permits within a date range by splitting it into
+        shards and fetching the shards concurrently.
+
+        A single range has to learn its total from page 1 before paging can
+        start; separate shards can each do that at the same time. All shards
+        share one HTTP client and rate limiter, and permits are de-duplicated
+        by permit number in case the API returns one in two shards.
+
         Args:
             start_date_str (str): Start date in 'MM/DD/YYYY' format.
             end_date_str (str): End date in 'MM/DD/YYYY' format.
-            delay_seconds (int): Seconds to wait between paginated requests.
+            writer (CsvRowWriter): Destination for processed permits. If None,
+                permits are only counted.
+            shard_days (int): Number of days in each shard.
+            max_concurrency (int): Maximum number of shards fetched at once.
 
         Returns:
-            list: A list of dictionaries, where each dictionary represents a processed permit.
-        """
-        all_permits = []
-        current_page = 1
-        total_records = 0 
-
-        print(f"Fetching solar permits from {start_date_str} to {end_date_str}...")
-
-        while True:
-            print(f"  Requesting page {current_page}...")
-            payload = {
-                'sort': '',
-                'page': current_page,
-                'pageSize': self.page_size,
-                'group': '',
-                'filter': '',
-                'PermitType': '',
-                'PermitNumber': '',
-                'TempPermit': 'Y',
-                'AddrNumber': '',
-                'AddrDirection': '',
-                'AddrStreet': '',
-                'AddrType': '',
-                'ProfName': '',
-                'ProfStateLicense': '',
-                'ProjectNumber': '',
-                'ProjectName': '',
-                'SolarGreenAdaptive': 'solar',
-                'SolarGreenAdaptiveStartDate': start_date_str,
-                'SolarGreenAdaptiveEndDate': end_date_str
-            }
-
-            response_data = self._make_request(payload)
-
-            if response_data is None:
-                print(f"  Failed to retrieve data for page {current_page}. Stopping.")
-                break # Stop if a request fails
-
-            permit_list_json = response_data.get("Data", [])
-            if not permit_list_json and current_page > 1:
-                # If we get an empty list on a page > 1, assume we're done
-                print("  No more permits found on this page.")
-                break
-
-            if current_page == 1:
-                total_records = response_data.get("Total", 0)
-                print(f"  Total records reported by API: {total_records}")
-                if total_records == 0:
-                    print("  No permits found for this date range.")
-                    break # No need to continue if total is 0
-                elif total_records > 0 and not permit_list_json:
-                     print("  API reported records, but none found on the first page. Stopping.")
-                     break # Avoid infinite loop if API reports total but returns empty data
-
-            # Process the permits found on this page
-            count_on_page = 0
-            for permit_json in permit_list_json:
-                processed = self._process_permit_data(permit_json)
-                if processed:
-                    all_permits.append(processed)
-                    count_on_page += 1
-            print(f"  Processed {count_on_page} valid permits from this page.")
-
-             # Check if we need to fetch the next page
-            # Exit if we've processed enough permits based on the total reported
-            # Or if the last page returned fewer items than page size (including zero)
-            if len(all_permits) >= total_records or len(permit_list_json) < self.page_size:
-                 print(f"  Fetched {len(all_permits)} permits. Reached expected total ({total_records}) or end of data.")
-                 break
-
-            # Prepare for the next page
-            current_page += 1
-            print(f"  Waiting {delay_seconds} seconds before next request...")
-            time.sleep(delay_seconds) # Be polite to the server
-
-        print(f"Finished fetching. Total processed permits: {len(all_permits)}")
-        return all_permits
+            int: The number of processed permits written.
+        """
+        shards = self._split_date_range(start_date_str, end_date_str, shard_days)
+        logger.info("Fetching solar permits from %s to %s in %d shards...", start_date_str, end_date_str, len(shards))
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        seen_permits = set()
+        async with self._open_async_client() as client:
+
+            async def fetch_shard(shard_start_str, shard_end_str):
+                async with semaphore:
+                    return await self.fetch_permits_async(shard_start_str, shard_end_str, writer, client,
+                                                          seen_permits)
+
+            shard_counts = await asyncio.gather(*(fetch_shard(s, e) for s, e in shards))
+
+        total_written = sum(shard_counts)
+        logger.info("Finished fetching all shards. Total processed permits: %d", total_written)
+        return total_written
+
+    def fetch_permits_for_date_range_parallel(self, start_date_str, end_date_str, writer=None, shard_days=7,
+                                              max_concurrency=8):
+        """
+        Fetches all solar permits within a date range, fetching shards of the range in parallel.
+
+        Synchronous wrapper around fetch_permits_parallel_async.
+
+        Args:
+            start_date_str (str): Start date in 'MM/DD/YYYY' format.
+            end_date_str (str): End date in 'MM/DD/YYYY' format.
+            writer (CsvRowWriter): Destination for processed permits. If None,
+                permits are only counted.
+            shard_days (int): Number of days in each shard.
+            max_concurrency (int): Maximum number of shards fetched at once.
+
+        Returns:
+            int: The number of processed permits written.
+        """
+        return asyncio.run(self.fetch_permits_parallel_async(start_date_str, end_date_str, writer, shard_days,
+                                                             max_concurrency))
+
 # --- Function to save data to CSV  ---
 def save_to_csv(data, filename):
     """
-    Saves a list of dictionaries to a CSV file.
+    Saves a list of processed permit tuples to a CSV file.
 
     Args:
-        data (list): A list of dictionaries.
+        data (list): A list of tuples in CSV_FIELDNAMES order.
         filename (str): The desired name for the output CSV file.
     """
     if not data:
-        print("No data provided to save.")
+        logger.warning("No data provided to save.")
         return
 
-    # Use keys from the first dictionary as headers
-    # Assumes all dictionaries have the same structure
-    fieldnames = data[0].keys()
-
     try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        with open(filename, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csvfile:
+            writer = CsvRowWriter(csvfile)
 
-            writer.writeheader() # Write the header row
+            writer.writerow(CSV_FIELDNAMES) # Write the header row
             writer.writerows(data) # Write all data rows
-        print(f"Successfully saved {len(data)} records to {filename}")
+        logger.info("Successfully saved %d records to %s", len(data), filename)
     except IOError as e:
-        print(f"Error writing to CSV file {filename}: {e}")
+        logger.error("Error writing to CSV file %s: %s", filename, e)
     except Exception as e:
-        print(f"An unexpected error occurred during CSV saving: {e}")
+        logger.error("An unexpected error occurred during CSV saving: %s", e)
 
 # --- Main execution block ---
 if __name__ == "__main__":
-   
+
+    # Progress goes to stdout alongside the banner; use logging.DEBUG for per-page detail
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    # httpx logs every request at INFO; keep per-page output behind DEBUG like our own messages
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
     # Set the specific date range
     start_date_to_fetch = "03/27/2025"
     end_date_to_fetch = "04/26/2025"
@@ -238,29 +795,27 @@ if __name__ == "__main__":
     print(f"Output file: {output_filename}")
     print("-" * 50)
 
-    # Instantiate the scraper (using page size 50 is efficient)
+    # Instantiate the scraper, then let it find the largest page size the API honours
     scraper = PhoenixPermitScraper(page_size=50)
+    scraper.negotiate_page_size(start_date_to_fetch, end_date_to_fetch)
 
-    # Fetch the permits
+    # Fetch the permits, writing each page to the CSV as it arrives
     try:
-        # The fetch_permits_for_date_range method handles pagination internally
-        fetched_permits = scraper.fetch_permits_for_date_range(start_date_to_fetch, end_date_to_fetch)
+        with open(output_filename, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csvfile:
+            writer = CsvRowWriter(csvfile)
+            writer.writerow(CSV_FIELDNAMES) # Write the header row
 
-        if fetched_permits:
-            # Save the results to CSV
-            save_to_csv(fetched_permits, output_filename)
-
-            # Optionally print some results to console
-            print(f"\n--- Fetched Permits ({len(fetched_permits)} total) ---")
-            print("--- First 5 Fetched Permits (Preview) ---")
-            for i, permit in enumerate(fetched_permits[:5]):
-                 print(f"Permit #{i+1}: {permit}")
-            if len(fetched_permits) > 5:
-                print("...")
+            # Split the range into weekly shards fetched in parallel; each shard handles pagination internally
+            fetched_count = scraper.fetch_permits_for_date_range_parallel(start_date_to_fetch, end_date_to_fetch,
+                                                                          writer=writer)
 
+        if fetched_count:
+            print(f"Successfully saved {fetched_count} records to {output_filename}")
         else:
             print("\nNo permits were fetched or processed.")
 
+    except IOError as e:
+        print(f"\nError writing to CSV file {output_filename}: {e}")
     except Exception as e:
         print(f"\nAn error occurred during the scraping process: {e}")
 